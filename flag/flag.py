@@ -2,9 +2,9 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 import datetime
 from enum import Enum
-import inspect
+from operator import attrgetter
 import sys
-from typing import Any, Callable, Dict, IO, List, NoReturn, Optional, Tuple
+from typing import Callable, Dict, IO, List, NoReturn, Optional, Tuple
 
 from flag.error import Error
 from flag.fmt import errorf
@@ -45,8 +45,11 @@ class Value[T](ABC):
     some differences between the two languages.
     """
 
-    def __init__(self, value: T, p: Pointer[T] = Ptr()) -> None:
-        p.set_(value)
+    def __init__(self, value: T, p: Optional[Pointer[T]] = None) -> None:
+        if p is None:
+            p = Ptr(value)
+        else:
+            p.set_(value)
         self.value: Pointer[T] = p
 
     def get(self) -> T:
@@ -243,9 +246,15 @@ class FlagSet:
         self.name: str = name
         self.parsed: bool = False
         self._actual: Dict[str, Flag] = {}
+        # _actual in lexicographical order, or None if it needs re-sorting
+        self._sorted_actual: Optional[List[Flag]] = None
         self._formal: Dict[str, Flag] = {}
+        # _formal in lexicographical order, or None if it needs re-sorting
+        self._sorted_formal: Optional[List[Flag]] = None
         # arguments after flags
         self.args: List[str] = []
+        # index of the next argument in args while parsing is in progress
+        self._arg_idx: int = 0
         self.error_handling = error_handling
         # output property getter will return stderr if otherwise unset
         self._output: Optional[IO] = None
@@ -267,11 +276,15 @@ class FlagSet:
         self._output = output
 
     def visit_all(self, fn: Visitor) -> None:
-        for flag in sort_flags(self._formal):
+        if self._sorted_formal is None:
+            self._sorted_formal = sort_flags(self._formal)
+        for flag in self._sorted_formal:
             fn(flag)
 
     def visit(self, fn: Visitor) -> None:
-        for flag in sort_flags(self._actual):
+        if self._sorted_actual is None:
+            self._sorted_actual = sort_flags(self._actual)
+        for flag in self._sorted_actual:
             fn(flag)
 
     def lookup(self, name: str) -> "Flag":
@@ -285,9 +298,8 @@ class FlagSet:
         return self._set_(name, value)
 
     def _set_(self, name: str, value: str) -> None:
-        try:
-            flag = self._formal[name]
-        except KeyError:
+        flag = self._formal.get(name)
+        if flag is None:
             # Remember that a flag that isn't defined is being set.
             # We raise an exception in this case, but in addition if
             # subsequently that flag is defined, we want to panic
@@ -298,13 +310,15 @@ class FlagSet:
             #
             # This edge case may not be relevant to Python, but nevertheless
             # we retain the behavior - for now.
-            info = inspect.stack()[2]
-            self._undef[name] = f"{info.filename}:{info.lineno}"
+            frame = sys._getframe(2)
+            self._undef[name] = f"{frame.f_code.co_filename}:{frame.f_lineno}"
 
             raise errorf(f"No such flag -{name}")
-        else:
-            set_value(flag.value, value)
+
+        set_value(flag.value, value)
+        if name not in self._actual:
             self._actual[name] = flag
+            self._sorted_actual = None
 
     def print_defaults(self) -> None:
         """
@@ -314,15 +328,14 @@ class FlagSet:
         information.
         """
 
+        lines: List[str] = []
         is_zero_value_errs: List[Error] = []
 
         def visitor(flag: Flag) -> None:
-            b: List[str] = []
-            b += f"  -{flag.name}"
+            b = f"  -{flag.name}"
             name, usage = unquote_usage(flag)
             if name:
-                b += " "
-                b += name
+                b += f" {name}"
             # Boolean flags of one ASCII letter are so common we treat them
             # specially, putting their usage on the same line
             if len(b) <= 4:
@@ -343,20 +356,23 @@ class FlagSet:
             else:
                 if not is_zero:
                     b += f" (default {flag.def_value})"
-            print("".join(b), file=self.output)
+            lines.append(f"{b}\n")
 
         self.visit_all(visitor)
 
         if is_zero_value_errs:
-            print("\n", file=self.output)
+            lines.append("\n\n")
             for exc in is_zero_value_errs:
-                print(str(exc), file=self.output)
+                lines.append(f"{exc}\n")
+
+        self.output.write("".join(lines))
 
     def default_usage(self) -> None:
         if self.name == "":
-            print("Usage:\n", file=self.output)
+            header = "Usage:\n\n"
         else:
-            print(f"Usage of {self.name}:\n", file=self.output)
+            header = f"Usage of {self.name}:\n\n"
+        self.output.write(header)
         self.print_defaults()
 
     @property
@@ -396,7 +412,7 @@ class FlagSet:
         Defines a bool flag with specified name, default value, and usage
         string. The return value is the value of the flag.
         """
-        p = Ptr(value)
+        p = Ptr()
         self.bool_var(p, name, value, usage)
         return p
 
@@ -413,7 +429,7 @@ class FlagSet:
         Defines an int flag with specified name, default value, and usage
         string. The return value is the value of the flag.
         """
-        p = Ptr(value)
+        p = Ptr()
         self.int_var(p, name, value, usage)
         return p
 
@@ -431,7 +447,7 @@ class FlagSet:
         Defines a string flag with specified name, default value, and usage
         string. The return value is the value of the flag.
         """
-        p = Ptr(value)
+        p = Ptr()
         self.string_var(p, name, value, usage)
         return p
 
@@ -449,7 +465,7 @@ class FlagSet:
         Defines a float flag with specified name, default value, and usage
         float. The return value is the value of the flag.
         """
-        p = Ptr(value)
+        p = Ptr()
         self.float_var(p, name, value, usage)
         return p
 
@@ -475,7 +491,7 @@ class FlagSet:
         Defines a duration flag with specified name, default value, and usage
         string. The return value is a pointer to a datetime.timedelta.
         """
-        p = Ptr(value)
+        p = Ptr()
         self.duration_var(p, name, value, usage)
         return p
 
@@ -513,7 +529,13 @@ class FlagSet:
         elif "=" in name:
             panic(f"flag {name} contains =")
 
-        flag = Flag(name, usage, value, str(value))
+        # The zero value is constant for a given value, so compute it once
+        # here rather than every time usage is printed.
+        try:
+            zero_value: Optional[str] = value.zero_str()
+        except Panic:
+            zero_value = None
+        flag = Flag(name, usage, value, str(value), zero_value)
         if name in self._formal:
             if self.name == "":
                 msg = f"flag redefined: {name}"
@@ -524,19 +546,16 @@ class FlagSet:
         if pos != "":
             panic(f"flag {name} set at {pos} before being defined")
         self._formal[name] = flag
+        self._sorted_formal = None
 
-    # Formats the message, prints it to output, and returns it
-    def sprintf(self, format_: str, *args: Any, **kwargs: Any) -> str:
-        msg = format_.format(*args, **kwargs)
+    # Prints the (already formatted) message to output, and returns it
+    def sprintf(self, msg: str) -> str:
         print(msg, file=self.output)
         return msg
 
-    # Prints to standard error a formatted error and usage message, and
-    # raises the error.
-    def failf(
-        self, format_: str, *args: Any, exc: Optional[Exception] = None, **kwargs: Any
-    ) -> NoReturn:
-        msg = format_.format(*args, **kwargs)
+    # Prints to standard error an (already formatted) error and usage
+    # message, and raises the error.
+    def failf(self, msg: str, exc: Optional[Exception] = None) -> NoReturn:
         self.usage()
         err = Error(msg)
         if exc:
@@ -544,102 +563,93 @@ class FlagSet:
         else:
             raise err
 
-    def parse_one(self) -> bool:
-        if not self.args:
+    # Parses one flag, advancing the _arg_idx cursor past it. This is only
+    # valid inside parse, which trims the consumed arguments from args when
+    # it finishes; until then, args (and anything that reads it, such as a
+    # usage function or flag callback) still includes them.
+    def _parse_one(self) -> bool:
+        args = self.args
+        i = self._arg_idx
+        if i >= len(args):
             return False
-        s = self.args[0]
-        if len(s) < 2 or s[0] != "-":
+        s = args[i]
+        if len(s) < 2 or not s.startswith("-"):
             return False
-        num_minuses = 1
-        if s[1] == "-":
-            num_minuses += 1
-            if len(s) == 2:
-                self.args = self.args[1:]
-                return False
-        name = s[num_minuses:]
+        if s == "--":
+            # "--" terminates the flags
+            self._arg_idx = i + 1
+            return False
+        name = s[2:] if s.startswith("--") else s[1:]
         if not name or name[0] == "-" or name[0] == "=":
-            self.failf("bad flag syntax: {arg}", arg=s)
-        self.args = self.args[1:]
-        has_value = False
-        value = ""
-        for i in range(len(name)):
-            if name[i] == "=":
-                value = name[i + 1 :]
-                has_value = True
-                name = name[0:i]
-                break
-        if name not in self._formal:
+            self.failf(f"bad flag syntax: {s}")
+        self._arg_idx = i = i + 1
+        name, eq, value = name.partition("=")
+        has_value = bool(eq)
+        flag = self._formal.get(name)
+        if flag is None:
             # special case for nice help message.
             if name == "help" or name == "h":
                 self.usage()
                 raise HelpError()
-            self.failf("flag provided but not defined: -{name}", name=name)
-
-        flag = self._formal[name]
+            self.failf(f"flag provided but not defined: -{name}")
 
+        fv = flag.value
         # special case: doesn't need an arg
-        if flag.value.is_bool_flag:
+        if fv.is_bool_flag:
             if has_value:
                 try:
-                    set_value(flag.value, value)
+                    set_value(fv, value)
                 except Error as exc:
-                    self.failf(
-                        "invalid boolean value {value} for -{name}: {exc}",
-                        value=value,
-                        name=name,
-                        exc=exc,
-                    )
+                    self.failf(f"invalid boolean value {value} for -{name}: {exc}", exc)
             else:
                 try:
-                    set_value(flag.value, "true")
+                    set_value(fv, "true")
                 except Error as exc:
-                    self.failf(
-                        "invalid boolean flag {name}: {value}",
-                        name=name,
-                        value=value,
-                        exc=exc,
-                    )
+                    self.failf(f"invalid boolean flag {name}: {exc}", exc)
         else:
             # It must have a value, which might be the next argument.
-            if not has_value and self.args:
+            if not has_value and i < len(args):
                 has_value = True
-                value = self.args[0]
-                self.args = self.args[1:]
+                value = args[i]
+                self._arg_idx = i + 1
             if not has_value:
-                self.failf("flag needs an argument: -{name}", name=name)
+                self.failf(f"flag needs an argument: -{name}")
             try:
-                set_value(flag.value, value)
+                set_value(fv, value)
             except Error as exc:
-                self.failf(
-                    "invalid value {value} for flag -{name}: {exc}",
-                    value=value,
-                    name=name,
-                    exc=exc,
-                )
-        self._actual[name] = flag
+                self.failf(f"invalid value {value} for flag -{name}: {exc}", exc)
+        if name not in self._actual:
+            self._actual[name] = flag
+            self._sorted_actual = None
         return True
 
     def parse(self, arguments: List[str]) -> None:
         self.parsed = True
         self.args = arguments
-        while True:
-            try:
-                seen: bool = self.parse_one()
-                if seen:
-                    continue
-                break
-            except Error as exc:
-                if self.error_handling == ErrorHandling.RAISE:
-                    raise exc
-                elif self.error_handling == ErrorHandling.EXIT:
-                    if isinstance(exc, HelpError):
-                        sys.exit(0)
-                    sys.exit(2)
-                else:
-                    panic(str(exc), exc=exc)
+        self._arg_idx = 0
+        # The try block wraps the whole loop, rather than each call to
+        # _parse_one, since any error ends parsing anyway.
+        parse_one = self._parse_one
+        try:
+            while parse_one():
+                pass
+        except Error as exc:
+            if self.error_handling == ErrorHandling.RAISE:
+                raise exc
+            elif self.error_handling == ErrorHandling.EXIT:
+                if isinstance(exc, HelpError):
+                    sys.exit(0)
+                sys.exit(2)
+            else:
+                panic(str(exc), exc=exc)
+        finally:
+            # _parse_one only advances a cursor; drop the consumed arguments
+            # once, here, rather than slicing args for every flag.
+            self.args = self.args[self._arg_idx :]
+            self._arg_idx = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Flag:
     """
     Represents the state of a flag.
@@ -648,19 +658,22 @@ class Flag:
     usage      help message
     value      value as set
     def_value  default value (as text); for usage message
+    zero_value zero value (as text), or None if the value has no zero value
     """
 
     name: str
     usage: str
     value: Value
     def_value: str
+    zero_value: Optional[str] = None
+
+
+_flag_name = attrgetter("name")
 
 
 # Returns the flags as a list in lexicographical sorted order.
 def sort_flags(flags: Dict[str, Flag]) -> List[Flag]:
-    result: List[Flag] = list(flags.values())
-    result.sort(key=lambda f: f.name)
-    return result
+    return sorted(flags.values(), key=_flag_name)
 
 
 def visit_all(fn: Visitor) -> None:
@@ -709,9 +722,13 @@ def is_zero_value(flag: "Flag", value: str) -> bool:
     strategy is very specific to go and its data types.
 
     Here, we require that the Value type implements a zero_str() method which
-    returns the string representation of a zero_str value.
+    returns the string representation of a zero_str value. This is computed
+    when the flag is defined and cached as flag.zero_value.
     """
 
+    if flag.zero_value is not None:
+        return value == flag.zero_value
+
     try:
         return value == flag.value.zero_str()
     except Panic as exc:
@@ -722,6 +739,17 @@ def is_zero_value(flag: "Flag", value: str) -> bool:
         ) from exc
 
 
+# Names shown in usage for the builtin value types. Booleans have no name,
+# since they don't take an argument.
+_VALUE_TYPE_NAMES: Dict[type, str] = {
+    BoolValue: "",
+    DurationValue: "duration",
+    FloatValue: "float",
+    IntValue: "int",
+    StringValue: "string",
+}
+
+
 def unquote_usage(flag: "Flag") -> Tuple[str, str]:
     """
     Extracts a back-quoted name from the usage string for a flag and
@@ -731,33 +759,30 @@ def unquote_usage(flag: "Flag") -> Tuple[str, str]:
     empty string if the flag is boolean.
     """
 
-    name: str = ""
     usage: str = flag.usage
-    for i, u in enumerate(usage):
-        if u == "`":
-            for j in range(i + 1, len(usage)):
-                if usage[j] == "`":
-                    name = usage[i + 1 : j]
-                    usage = usage[:i] + name + usage[j + 1]
-                    return (name, usage)
-            break
-    name = "value"
+    i = usage.find("`")
+    if i >= 0:
+        j = usage.find("`", i + 1)
+        if j >= 0:
+            name = usage[i + 1 : j]
+            usage = usage[:i] + name + usage[j + 1 :]
+            return (name, usage)
 
     fv: Value = flag.value
-    if isinstance(fv, BoolValue):
-        # TODO: when would this be false?
-        if fv.is_bool_flag:
-            name = ""
-    elif isinstance(fv, DurationValue):
-        name = "duration"
-    elif isinstance(fv, FloatValue):
-        name = "float"
-    elif isinstance(fv, IntValue):
-        name = "int"
-    elif isinstance(fv, StringValue):
-        name = "string"
+    # Subclasses of the builtin values get the name of their nearest builtin
+    # ancestor. The value's own type is checked first, and is usually a hit.
+    for cls in type(fv).__mro__:
+        type_name = _VALUE_TYPE_NAMES.get(cls)
+        if type_name is not None:
+            break
+    else:
+        type_name = "value"
+
+    # TODO: when would this be false?
+    if type_name == "" and not fv.is_bool_flag:
+        type_name = "value"
 
-    return (name, usage)
+    return (type_name, usage)
 
 
 def print_defaults() -> None:
@@ -807,7 +832,7 @@ def default_usage() -> None:
     ErrorHandling.EXIT by default.
     """
 
-    print(f"Usage of {sys.argv[0]}:\n", file=command_line.output)
+    command_line.output.write(f"Usage of {sys.argv[0]}:\n\n")
     print_defaults()
 
 
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, cast, Dict, Optional
+from typing import Any, Dict, Optional
 
 from flag.panic import panic
 
@@ -11,6 +11,8 @@ class Pointer[V](ABC):
     function which mutates its value.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def set_(self, value: V) -> None:
         """
@@ -200,6 +202,8 @@ class Ptr[V](Pointer):
     the value.
     """
 
+    __slots__ = ("value",)
+
     value: Optional[V]
 
     def __init__(self, value: Optional[V] = None) -> None:
@@ -257,6 +261,8 @@ class AttrRef[V](Pointer):
     and be of any Value, it's not viable to assert typing.
     """
 
+    __slots__ = ("obj", "name")
+
     obj: object
     name: str
 
@@ -274,21 +280,13 @@ class AttrRef[V](Pointer):
         """
         Dereference the pointer, getting the value of the underlying attribute.
         """
-        if not hasattr(self.obj, self.name):
-            panic("nil pointer dereference")
-        attr = getattr(self.obj, self.name)
+        attr = getattr(self.obj, self.name, None)
         if attr is not None:
-            return cast(V, attr)
+            return attr
         panic("nil pointer dereference")
 
     def is_nil(self) -> bool:
-        if not hasattr(self.obj, self.name):
-            return True
-
-        if getattr(self.obj, self.name) is None:
-            return True
-
-        return False
+        return getattr(self.obj, self.name, None) is None
 
     def __str__(self) -> str:
         return str(getattr(self.obj, self.name, None))
@@ -321,6 +319,8 @@ class KeyRef[V](Pointer):
     and be of any Value, it's not viable to assert typing.
     """
 
+    __slots__ = ("dict_", "key")
+
     dict_: Dict[Any, Any]
     key: Any
 
@@ -338,11 +338,9 @@ class KeyRef[V](Pointer):
         """
         Dereference the pointer, getting the value at the underlying key.
         """
-        if self.key not in self.dict_:
-            panic("nil pointer dereference")
-        value = self.dict_[self.key]
+        value = self.dict_.get(self.key)
         if value is not None:
-            return cast(V, value)
+            return value
         panic("nil pointer dereference")
 
     def is_nil(self) -> bool:
@@ -1,15 +1,26 @@
-import re
-
 import flag.time as time
 
+_BOOLS = {
+    "1": True,
+    "t": True,
+    "T": True,
+    "TRUE": True,
+    "true": True,
+    "True": True,
+    "0": False,
+    "f": False,
+    "F": False,
+    "FALSE": False,
+    "false": False,
+    "False": False,
+}
 
-def parse_bool(string: str) -> bool:
-    if string in {"1", "t", "T", "TRUE", "true", "True"}:
-        return True
-    elif string in {"0", "f", "F", "FALSE", "false", "False"}:
-        return False
 
-    raise ValueError("invalid syntax")
+def parse_bool(string: str) -> bool:
+    b = _BOOLS.get(string)
+    if b is None:
+        raise ValueError("invalid syntax")
+    return b
 
 
 def format_bool(b: bool) -> str:
@@ -19,7 +30,8 @@ def format_bool(b: bool) -> str:
 
 
 def format_float(f: float) -> str:
-    return re.sub(r"\.0*$", "", str(f))
+    # str() of a whole float always ends in exactly ".0"
+    return str(f).removesuffix(".0")
 
 
 def format_duration(delta: time.Duration) -> str:
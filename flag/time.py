@@ -1,6 +1,20 @@
 import datetime
 
-from flag.panic import panic, Panic
+from flag.panic import panic
+
+_DIGITS = frozenset("0123456789")
+
+# Nanoseconds per unit
+_UNITS = {
+    "ns": 1,
+    "us": 1000,
+    "µs": 1000,  # U+00B5 micro sign
+    "μs": 1000,  # U+03BC Greek letter mu
+    "ms": 1000 * 1000,
+    "s": 1000 * 1000 * 1000,
+    "m": 60 * 1000 * 1000 * 1000,
+    "h": 60 * 60 * 1000 * 1000 * 1000,
+}
 
 
 class Duration(datetime.timedelta):
@@ -20,49 +34,97 @@ class Duration(datetime.timedelta):
         return datetime.timedelta(seconds=duration.total_seconds())
 
     def __str__(self) -> str:
-        secs = int(self.total_seconds())
-        mins = secs // 60
-        hours = secs // 3600
-        secs = secs % 60
-        fmt = f"{secs}s"
-        if mins:
-            fmt = f"{mins}m{fmt}"
+        # Work in whole microseconds, timedelta's resolution, rather than
+        # the float returned by total_seconds().
+        micros = (self.days * 86400 + self.seconds) * 1000000 + self.microseconds
+        if not micros:
+            return "0s"
+        sign = "-" if micros < 0 else ""
+        micros = abs(micros)
+        # Durations under a second use a smaller unit, such as "1.5ms".
+        if micros < 1000:
+            return f"{sign}{micros}µs"
+        if micros < 1000000:
+            return f"{sign}{_format_frac(*divmod(micros, 1000), 3)}ms"
+        secs, frac = divmod(micros, 1000000)
+        mins, secs = divmod(secs, 60)
+        hours, mins = divmod(mins, 60)
+        secs_str = _format_frac(secs, frac, 6)
         if hours:
-            fmt = f"{hours}h{fmt}"
-        return fmt
+            return f"{sign}{hours}h{mins}m{secs_str}s"
+        if mins:
+            return f"{sign}{mins}m{secs_str}s"
+        return f"{sign}{secs_str}s"
+
+
+def _format_frac(whole: int, frac: int, digits: int) -> str:
+    """
+    Format a whole number and a fraction of the given number of digits,
+    dropping trailing zeros from the fraction.
+    """
+    if not frac:
+        return str(whole)
+    return f"{whole}.{frac:0{digits}d}".rstrip("0")
 
 
 def parse_duration(s: str) -> Duration:
     """
     Parse a string into a Duration.
+
+    A duration string is a possibly signed sequence of decimal numbers, each
+    with optional fraction and a unit suffix, such as "300ms", "-1.5h" or
+    "2h45m". Valid time units are "ns", "us" (or "µs"), "ms", "s", "m", "h".
+    Since timedelta has microsecond resolution, any smaller remainder is
+    truncated.
     """
     error = f"invalid format for duration: {s}"
-    hours = ""
-    mins = ""
-    secs = ""
-    buf = ""
-    for c in s:
-        print("c:", c)
-        if c == "s":
-            secs = buf
-            buf = ""
-        elif c == "m":
-            mins = buf
-            buf = ""
-        elif c == "h":
-            hours = buf
-            buf = ""
-        else:
-            buf += c
-
-    if buf:
+    n = len(s)
+    i = 0
+    neg = False
+    if n and s[0] in "+-":
+        neg = s[0] == "-"
+        i += 1
+    # Special case: a bare zero needs no unit.
+    if s[i:] == "0":
+        return Duration()
+    if i == n:
         panic(error)
 
+    nanos = 0
+    while i < n:
+        # The integer part
+        start = i
+        while i < n and s[i] in _DIGITS:
+            i += 1
+        whole = s[start:i]
+        # The fractional part
+        frac = ""
+        if i < n and s[i] == ".":
+            i += 1
+            start = i
+            while i < n and s[i] in _DIGITS:
+                i += 1
+            frac = s[start:i]
+        if not whole and not frac:
+            panic(error)
+        # The unit
+        start = i
+        while i < n and s[i] != "." and s[i] not in _DIGITS:
+            i += 1
+        unit = _UNITS.get(s[start:i])
+        if unit is None:
+            panic(error)
+        try:
+            if whole:
+                nanos += int(whole) * unit
+            if frac:
+                nanos += int(frac) * unit // 10 ** len(frac)
+        except ValueError as exc:
+            # int() refuses strings past the integer digit limit
+            panic(error, exc)
+
+    micros = nanos // 1000
     try:
-        return Duration(
-            hours=int(hours) if hours else 0,
-            minutes=int(mins) if mins else 0,
-            seconds=int(secs) if secs else 0,
-        )
-    except Exception as exc:
-        raise Panic(error) from exc
+        return Duration(microseconds=-micros if neg else micros)
+    except OverflowError as exc:
+        panic(error, exc)
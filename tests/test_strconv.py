@@ -0,0 +1,37 @@
+import pytest
+
+from flag.strconv import format_float, parse_bool
+
+
+@pytest.mark.parametrize("string", ["1", "t", "T", "TRUE", "true", "True"])
+def test_parse_bool_true(string) -> None:
+    assert parse_bool(string) is True
+
+
+@pytest.mark.parametrize("string", ["0", "f", "F", "FALSE", "false", "False"])
+def test_parse_bool_false(string) -> None:
+    assert parse_bool(string) is False
+
+
+@pytest.mark.parametrize("string", ["", "yes", "tRuE", "2"])
+def test_parse_bool_invalid(string) -> None:
+    with pytest.raises(ValueError):
+        parse_bool(string)
+
+
+@pytest.mark.parametrize(
+    "f,expected",
+    [
+        (0.0, "0"),
+        (1.0, "1"),
+        (100.0, "100"),
+        (-2.0, "-2"),
+        (2.7, "2.7"),
+        (10.05, "10.05"),
+        (2718e28, "2.718e+31"),
+        (1e16, "1e+16"),
+        (float("inf"), "inf"),
+    ],
+)
+def test_format_float(f, expected) -> None:
+    assert format_float(f) == expected
@@ -0,0 +1,78 @@
+import pytest
+
+from flag.panic import Panic
+from flag.time import Duration, parse_duration
+
+
+@pytest.mark.parametrize(
+    "string,expected",
+    [
+        ("0", Duration()),
+        ("5s", Duration(seconds=5)),
+        ("+5s", Duration(seconds=5)),
+        ("-5s", Duration(seconds=-5)),
+        ("2m", Duration(minutes=2)),
+        ("3h", Duration(hours=3)),
+        ("1h2m3s", Duration(hours=1, minutes=2, seconds=3)),
+        ("1.5h", Duration(hours=1, minutes=30)),
+        (".5s", Duration(milliseconds=500)),
+        ("1.s", Duration(seconds=1)),
+        ("300ms", Duration(milliseconds=300)),
+        ("10us", Duration(microseconds=10)),
+        ("10µs", Duration(microseconds=10)),
+        ("10μs", Duration(microseconds=10)),
+        ("1500ns", Duration(microseconds=1)),
+    ],
+)
+def test_parse_duration(string, expected) -> None:
+    assert parse_duration(string) == expected
+
+
+@pytest.mark.parametrize("string", ["", "-", "3", "s", ".s", "1d", "1.2.3s", "-.s"])
+def test_parse_duration_invalid(string) -> None:
+    with pytest.raises(Panic):
+        parse_duration(string)
+
+
+def test_parse_duration_too_many_digits() -> None:
+    with pytest.raises(Panic):
+        parse_duration("1" * 5000 + "s")
+
+
+@pytest.mark.parametrize(
+    "duration,expected",
+    [
+        (Duration(), "0s"),
+        (Duration(seconds=5), "5s"),
+        (Duration(seconds=60), "1m0s"),
+        (Duration(minutes=2, seconds=3), "2m3s"),
+        (Duration(hours=1), "1h0m0s"),
+        (Duration(hours=1, minutes=1, seconds=1), "1h1m1s"),
+        (Duration(hours=25, seconds=5), "25h0m5s"),
+        (Duration(seconds=-90), "-1m30s"),
+        (Duration(microseconds=10), "10µs"),
+        (Duration(microseconds=1500), "1.5ms"),
+        (Duration(milliseconds=500), "500ms"),
+        (Duration(seconds=1, milliseconds=500), "1.5s"),
+        (Duration(hours=1, milliseconds=500), "1h0m0.5s"),
+        (Duration(milliseconds=-250), "-250ms"),
+    ],
+)
+def test_duration_str(duration, expected) -> None:
+    assert str(duration) == expected
+
+
+@pytest.mark.parametrize(
+    "string,expected",
+    [
+        ("500ms", "500ms"),
+        ("1.5s", "1.5s"),
+        ("1h0m0.5s", "1h0m0.5s"),
+        ("10us", "10µs"),
+        ("1.000001s", "1.000001s"),
+        ("90s", "1m30s"),
+        ("-1.5h", "-1h30m0s"),
+    ],
+)
+def test_parse_duration_str(string, expected) -> None:
+    assert str(parse_duration(string)) == expected